@@ -1,4 +1,5 @@
 import asyncio
+import multiprocessing
 import sys
 from pathlib import Path
 import argparse
@@ -129,17 +130,20 @@ def update_known_words(new_words: List[str]):
         config_dir.mkdir(exist_ok=True)
         known_path = config_dir / 'known_words.txt'
         
+        # Compare as raw UTF-8 bytes to avoid decoding the whole file into str objects
         existing = set()
         if known_path.exists():
-            existing = set(known_path.read_text(encoding='utf-8').splitlines())
+            existing = set(known_path.read_bytes().splitlines())
             
-        new_unique = set(new_words) - existing
+        new_unique = {word.encode('utf-8') for word in new_words} - existing
         if new_unique:
-            with known_path.open('a', encoding='utf-8') as f:
-                f.write('\n'.join(new_unique) + '\n')
+            with known_path.open('ab') as f:
+                f.write(b'\n'.join(new_unique) + b'\n')
     except Exception as e:
         print(f"Warning: Could not update known words: {str(e)}")
     
 
 if __name__ == '__main__':
+    # Book extraction uses worker processes; required for frozen Windows builds
+    multiprocessing.freeze_support()
     main()
@@ -1,22 +1,79 @@
 # src/book2anki/core/utils.py
 import time
-from collections import deque
 import asyncio
+import multiprocessing
+from typing import Optional
+
+# Process pools are started after worker threads (asyncio.to_thread, tqdm's monitor) already exist,
+# and forking a multi-threaded process can deadlock
+MP_CONTEXT = multiprocessing.get_context("spawn")
 
 class AsyncRateLimiter:
     """Shared rate limiter using token bucket algorithm"""
     def __init__(self, max_calls: int, period: float):
         self.max_calls = max_calls
         self.period = period
-        self.timestamps = deque()
+        self.rate = max_calls / period
+        self.tokens = float(max_calls)
+        self.last = time.monotonic()
+        # Recreated per event loop so class-level limiters survive repeated asyncio.run calls
+        self._lock: Optional[asyncio.Lock] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
 
     async def wait(self):
-        while True:
+        loop = asyncio.get_running_loop()
+        if self._lock is None or self._loop is not loop:
+            self._lock = asyncio.Lock()
+            self._loop = loop
+        async with self._lock:
             now = time.monotonic()
-            while self.timestamps and self.timestamps[0] <= now - self.period:
-                self.timestamps.popleft()
-            if len(self.timestamps) < self.max_calls:
-                break
-            sleep_time = self.period - (now - self.timestamps[0])
-            await asyncio.sleep(sleep_time)
-        self.timestamps.append(now)
+            self.tokens = min(self.max_calls, self.tokens + (now - self.last) * self.rate)
+            self.last = now
+            if self.tokens < 1:
+                await asyncio.sleep((1 - self.tokens) / self.rate)
+                self.last = time.monotonic()
+                self.tokens = 1
+            self.tokens -= 1
+
+class AdmissionController:
+    """Concurrency limit that can be resized while requests are in flight"""
+    def __init__(self, max_concurrent: int):
+        self.active = 0
+        self.max_concurrent = max_concurrent
+        # Recreated per event loop so class-level controllers survive repeated asyncio.run calls
+        self._cond: Optional[asyncio.Condition] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    def _condition(self) -> asyncio.Condition:
+        loop = asyncio.get_running_loop()
+        if self._cond is None or self._loop is not loop:
+            self._cond = asyncio.Condition()
+            self._loop = loop
+            # Slots held under a previous loop can never be released
+            self.active = 0
+        return self._cond
+
+    async def acquire(self):
+        cond = self._condition()
+        async with cond:
+            await cond.wait_for(lambda: self.active < self.max_concurrent)
+            self.active += 1
+
+    async def release(self):
+        cond = self._condition()
+        async with cond:
+            self.active -= 1
+            cond.notify(1)
+
+    async def resize(self, max_concurrent: int):
+        cond = self._condition()
+        async with cond:
+            self.max_concurrent = max(1, max_concurrent)
+            cond.notify_all()
+
+    async def __aenter__(self):
+        await self.acquire()
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.release()
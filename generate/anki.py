@@ -2,11 +2,15 @@
 from pathlib import Path
 import genanki
 import hashlib
+import functools
 import aiohttp
 import aiofiles
+import aiofiles.os
 import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from tqdm import tqdm
 from tqdm.asyncio import tqdm_asyncio
-from typing import List, Dict, Optional
+from typing import List, Dict, Optional, Set
 from dataclasses import dataclass
 
 from core.utils import AsyncRateLimiter  
@@ -49,16 +53,34 @@ PHRASAL_MODEL = TemplateConfig(
     css_file='shared_style.css'
 )
 
+# ---------- Note HTML Fragments ----------
+_MEANING_OPEN = '<div class="meaning-container"><div class="meaning-header"><span class="meaning-text definition-text">'
+_MEANING_HEADER_CLOSE = '</span></div>'
+_SENSE_OPEN = '<div class="meaning-container"><div class="sense-header"><span class="sense-definition definition-text">'
+_CEFR_OPEN = '<span class="cefr">'
+_SPAN_CLOSE = '</span>'
+_DIV_CLOSE = '</div>'
+_EXAMPLES_OPEN = '<ul class="examples-list">'
+_EXAMPLES_CLOSE = '</ul>'
+_EXAMPLE_OPEN = '<li class="example">'
+_EXAMPLE_CLOSE = '</li>'
+
 # ---------- Template Loader ----------
+# Models are built once per template directory and shared by every generator
+_MODELS_CACHE: Dict[Path, Dict[str, genanki.Model]] = {}
+
 class TemplateLoader:
     def __init__(self, template_dir: Path = Path("config/templates")):
         self.template_dir = template_dir
         
-    def _read_file(self, path: str) -> str:
-        full_path = self.template_dir / path
-        if not full_path.exists():
-            raise FileNotFoundError(f"Template file {full_path} not found")
-        return full_path.read_text(encoding='utf-8')
+    @staticmethod
+    @functools.lru_cache(maxsize=None)
+    def _read_file(template_dir: Path, path: str) -> str:
+        full_path = template_dir / path
+        try:
+            return full_path.read_text(encoding='utf-8')
+        except FileNotFoundError:
+            raise FileNotFoundError(f"Template file {full_path} not found") from None
 
     def load_model(self, config: TemplateConfig) -> genanki.Model:
         return genanki.Model(
@@ -67,25 +89,38 @@ class TemplateLoader:
             fields=[{'name': field} for field in config.fields],
             templates=[{
                 'name': 'Card 1',
-                'qfmt': self._read_file(config.front_template),
-                'afmt': self._read_file(config.back_template),
+                'qfmt': self._read_file(self.template_dir, config.front_template),
+                'afmt': self._read_file(self.template_dir, config.back_template),
             }],
-            css=self._read_file(config.css_file)
+            css=self._read_file(self.template_dir, config.css_file)
         )
 
     def load_all_models(self) -> Dict[str, genanki.Model]:
-        return {
-            'words': self.load_model(WORD_MODEL),
-            'idioms': self.load_model(IDIOM_MODEL),
-            'phrasal': self.load_model(PHRASAL_MODEL)
-        }
+        models = _MODELS_CACHE.get(self.template_dir)
+        if models is None:
+            models = _MODELS_CACHE[self.template_dir] = {
+                'words': self.load_model(WORD_MODEL),
+                'idioms': self.load_model(IDIOM_MODEL),
+                'phrasal': self.load_model(PHRASAL_MODEL)
+            }
+        return models
+
+# ---------- Package Writer ----------
+class FastPackage(genanki.Package):
+    """Package whose throwaway collection DB skips journaling and fsync"""
+    def write_to_db(self, cursor, timestamp: float, id_gen):
+        cursor.execute("PRAGMA journal_mode=OFF")
+        cursor.execute("PRAGMA synchronous=OFF")
+        cursor.execute("PRAGMA temp_store=MEMORY")
+        super().write_to_db(cursor, timestamp, id_gen)
 
 # ---------- Media Downloader ----------
 class MediaDownloader:    
     def __init__(self, cache_dir: Path = Path.home() / ".cache/book2anki/media_cache", max_concurrent: int = 10):
         self.cache_dir = cache_dir
         self.cache_dir.mkdir(parents=True, exist_ok=True)
-        self.url_to_filename = {}
+        # One future per URL so concurrent requests for the same audio share a single download
+        self._inflight: Dict[str, asyncio.Future] = {}
         self.session = None
         self.semaphore = asyncio.Semaphore(max_concurrent)
         self.rate_limiter = AsyncRateLimiter(20, 1.0)
@@ -97,25 +132,48 @@ class MediaDownloader:
     async def download_audio(self, url: str) -> Optional[str]:
         if not url:
             return None
-            
-        if url in self.url_to_filename:
-            return self.url_to_filename[url]
+
+        if url in self._inflight:
+            return await asyncio.shield(self._inflight[url])
+
+        fut = asyncio.get_running_loop().create_future()
+        self._inflight[url] = fut
+        try:
+            filename = await self._fetch_to_cache(url)
+        except asyncio.CancelledError:
+            del self._inflight[url]
+            fut.cancel()
+            raise
+        except Exception as e:
+            del self._inflight[url]
+            fut.set_exception(e)
+            fut.exception()  # mark retrieved so a failure nobody waited on isn't logged
+            raise
+
+        if filename is None:
+            # Let a later request retry a failed download
+            del self._inflight[url]
+        fut.set_result(filename)
+        return filename
+
+    async def _fetch_to_cache(self, url: str) -> Optional[str]:
+        filename = hashlib.blake2b(url.encode(), digest_size=16).hexdigest() + ".mp3"
+        filepath = self.cache_dir / filename
 
         async with self.semaphore:
             for attempt in range(3):
                 try:
                     await self.rate_limiter.wait()
-                    filename = hashlib.md5(url.encode()).hexdigest() + ".mp3"
-                    filepath = self.cache_dir / filename
-
-                    if not filepath.exists():
-                        async with self.session.get(url, headers=self.headers, timeout=20) as response:
+                    if not await aiofiles.os.path.exists(filepath):
+                        async with self.session.get(url, timeout=20) as response:
                             response.raise_for_status()
                             content = await response.read()
-                            async with aiofiles.open(filepath, "wb") as f:
-                                await f.write(content)
+                        # Write aside and rename so an aborted run never leaves a truncated file in the cache
+                        tmp_path = filepath.with_suffix(".part")
+                        async with aiofiles.open(tmp_path, "wb") as f:
+                            await f.write(content)
+                        await aiofiles.os.replace(tmp_path, filepath)
 
-                    self.url_to_filename[url] = filename
                     return filename
                     
                 except (aiohttp.ClientError, asyncio.TimeoutError) as e:
@@ -137,9 +195,8 @@ class AnkiGenerator:
         self.main_deck, self.words_deck, self.idioms_deck, self.phrasal_deck = self._create_decks(deck_name)
         self.models = TemplateLoader().load_all_models()
         self.media_downloader = MediaDownloader(cache_dir, max_concurrent)
-        self.media_files = []
-        self.media_lock = asyncio.Lock()
-        self.word_semaphore = asyncio.Semaphore(max_concurrent)
+        self.max_concurrent = max_concurrent
+        self.media_files: Set[str] = set()
         self.valid_words = 0
 
     def _create_decks(self, base_name: str) -> tuple:
@@ -155,58 +212,90 @@ class AnkiGenerator:
         return int(hashlib.md5(name.encode()).hexdigest()[:8], 16) % 10**10
 
     async def generate_deck(self, words: List[str], output_path: Path) -> None:
-        async with aiohttp.ClientSession() as session:
+        connector = aiohttp.TCPConnector(
+            limit=self.max_concurrent,
+            limit_per_host=self.max_concurrent,
+            ttl_dns_cache=300,
+            keepalive_timeout=60
+        )
+        async with aiohttp.ClientSession(connector=connector, headers=self.media_downloader.headers) as session:
             self.media_downloader.session = session
 
-            tasks = [self._process_word(session, word) for word in words]
-            results = await tqdm_asyncio.gather(*tasks, desc="Processing words")
-
-            # Parallelize entry processing
-            entry_tasks = []
-            for entries in filter(None, results):
-                for entry in entries:
-                    entry_tasks.append(self._process_entry(entry))
-
-            await tqdm_asyncio.gather(*entry_tasks, desc="Creating notes")
-
-            media_set = set(self.media_files)
-            media_list = list(media_set)
+            try:
+                results = await self._process_words(session, words)
+            finally:
+                await Word.close()
+
+            all_entries = [entry for entries in filter(None, results) for entry in entries]
+
+            # Only word notes wait on audio downloads; idioms and phrasal verbs are built inline
+            word_notes = await tqdm_asyncio.gather(
+                *(self._process_main_entry(entry) for entry in all_entries),
+                desc="Creating notes"
+            )
+            idiom_notes: List[genanki.Note] = []
+            phrasal_notes: List[genanki.Note] = []
+            for entry in all_entries:
+                idiom_notes.extend(self._process_idioms(entry.get('idioms', [])))
+                phrasal_notes.extend(self._process_phrasal_verbs(entry.get('phrasal_verbs', [])))
+
+            # Idioms and phrasal verbs are often listed under several headwords; keep one note per GUID
+            seen_guids = set()
+            for deck, notes in (
+                (self.words_deck, filter(None, word_notes)),
+                (self.idioms_deck, idiom_notes),
+                (self.phrasal_deck, phrasal_notes)
+            ):
+                for note in notes:
+                    if note.guid not in seen_guids:
+                        seen_guids.add(note.guid)
+                        deck.add_note(note)
 
             # Split package creation
-            package = genanki.Package([self.main_deck, self.words_deck, self.idioms_deck, self.phrasal_deck])
-            package.media_files = media_list
+            package = FastPackage([self.main_deck, self.words_deck, self.idioms_deck, self.phrasal_deck])
+            package.media_files = list(self.media_files)
 
             await self._write_package_in_chunks(package, output_path)
             return self.valid_words
         
     async def _write_package_in_chunks(self, package, output_path):
         """Workaround for genanki's blocking write operation"""
-        loop = asyncio.get_event_loop()
-        await loop.run_in_executor(
-            None, 
-            lambda: package.write_to_file(str(output_path))
-        )
+        loop = asyncio.get_running_loop()
+        # A single dedicated thread, shut down once the package is written
+        with ThreadPoolExecutor(max_workers=1) as writer:
+            await loop.run_in_executor(writer, package.write_to_file, str(output_path))
     
+    async def _process_words(self, session: aiohttp.ClientSession, words: List[str]) -> List[Optional[List[Dict]]]:
+        """Fetch words with max_concurrent workers draining a shared queue, keeping input order"""
+        queue: asyncio.Queue = asyncio.Queue()
+        for item in enumerate(words):
+            queue.put_nowait(item)
+        results: List[Optional[List[Dict]]] = [None] * len(words)
+
+        with tqdm(total=len(words), desc="Processing words") as progress:
+            async def worker() -> None:
+                while not queue.empty():
+                    idx, word = queue.get_nowait()
+                    results[idx] = await self._process_word(session, word)
+                    progress.update(1)
+
+            await asyncio.gather(*(worker() for _ in range(min(self.max_concurrent, len(words)))))
+        return results
+
     async def _process_word(self, session: aiohttp.ClientSession, word_str: str) -> Optional[List[Dict]]:
-        async with self.word_semaphore:
-            try:
-                word = Word(word_str)
-                await word.initialize()
-                self.valid_words += 1
-                return word.entries
-            except WordNotFound:
-                # print(f"Word not found: {word_str}")
-                return None
-            except Exception as e:
-                print(f"Error processing {word_str}: {e}")
-                return None
-
-    async def _process_entry(self, entry: Dict) -> None:
-        await self._process_main_entry(entry)
-        await self._process_idioms(entry.get('idioms', []))
-        await self._process_phrasal_verbs(entry.get('phrasal_verbs', []))
-
-    async def _process_main_entry(self, entry: Dict) -> None:
+        try:
+            word = Word(word_str)
+            await word.initialize()
+            self.valid_words += 1
+            return word.entries
+        except WordNotFound:
+            # print(f"Word not found: {word_str}")
+            return None
+        except Exception as e:
+            print(f"Error processing {word_str}: {e}")
+            return None
+
+    async def _process_main_entry(self, entry: Dict) -> Optional[genanki.Note]:
         try:
             us_pron = entry.get('pronunciations', {}).get('us', {})
             us_audio = await self._safe_download(us_pron.get('audio'))
@@ -219,32 +308,45 @@ class AnkiGenerator:
                 f"[sound:{us_audio}]" if us_audio else ""
             ]
             
-            note = genanki.Note(model=self.models['words'], fields=note_fields)
-            self.words_deck.add_note(note)
+            meanings = entry.get('meanings', [])
+            # Hash only identifying fields; the first definition separates homographs like bass_1/bass_2
+            guid = genanki.guid_for(
+                entry.get('headword', ''),
+                entry.get('part_of_speech', ''),
+                meanings[0].get('definition', '') if meanings else ''
+            )
+            return genanki.Note(model=self.models['words'], fields=note_fields, guid=guid)
             
         except Exception as e:
             print(f"Error processing main entry: {str(e)}")
+            return None
 
-    async def _process_idioms(self, idioms: List[Dict]) -> None:
-        for idiom in idioms:
-            self.idioms_deck.add_note(genanki.Note(
+    def _process_idioms(self, idioms: List[Dict]) -> List[genanki.Note]:
+        return [
+            genanki.Note(
                 model=self.models['idioms'],
                 fields=[
                     idiom['idiom'],
                     idiom['definition'],
                     self._format_idiom_examples(idiom['examples'])
-                ]
-            ))
-
-    async def _process_phrasal_verbs(self, phrasal_verbs: List[Dict]) -> None:
-        for pv in phrasal_verbs:
-            self.phrasal_deck.add_note(genanki.Note(
+                ],
+                guid=genanki.guid_for(idiom['idiom'], idiom['definition'])
+            )
+            for idiom in idioms
+        ]
+
+    def _process_phrasal_verbs(self, phrasal_verbs: List[Dict]) -> List[genanki.Note]:
+        return [
+            genanki.Note(
                 model=self.models['phrasal'],
                 fields=[
                     pv['phrasal_verb'],
                     self._format_phrasal_definitions(pv['senses'])
-                ]
-            ))
+                ],
+                guid=genanki.guid_for(pv['phrasal_verb'])
+            )
+            for pv in phrasal_verbs
+        ]
 
     async def _safe_download(self, url: str) -> str:
         if not url:
@@ -252,8 +354,7 @@ class AnkiGenerator:
         try:
             filename = await self.media_downloader.download_audio(url)
             if filename:
-                async with self.media_lock:
-                    self.media_files.append(str(self.media_downloader.cache_dir / filename))
+                self.media_files.add(str(self.media_downloader.cache_dir / filename))
                 return filename
             return ""
         except Exception as e:
@@ -261,52 +362,43 @@ class AnkiGenerator:
             return ""
 
     def _format_meanings(self, meanings: List[Dict]) -> str:
-        html = []
-        for idx, meaning in enumerate(meanings, 1):
-            definition = meaning.get('definition', '')
-            examples = meaning.get('examples', [])
-            level = meaning.get('level', '')
-            
-            examples_html = "".join(
-                f'<li class="example">{ex}</li>' 
-                for ex in examples
-            ) if examples else ""
-            
-            html.append(f"""
-                <div class="meaning-container">
-                    <div class="meaning-header">
-                        <span class="meaning-text definition-text">{definition}</span>
-                    </div>
-                    {f'<ul class="examples-list">{examples_html}</ul>' if examples else ''}
-                </div>
-            """)
-        return "".join(html)
+        parts: List[str] = []
+        for meaning in meanings:
+            parts.append(_MEANING_OPEN)
+            parts.append(meaning.get('definition', ''))
+            parts.append(_MEANING_HEADER_CLOSE)
+            self._append_examples(parts, meaning.get('examples', []))
+            parts.append(_DIV_CLOSE)
+        return "".join(parts)
 
     def _format_phrasal_definitions(self, senses: List[Dict]) -> str:
-        html = []
-        for idx, sense in enumerate(senses, 1):
-            definition = sense.get('definition', '')
-            examples = sense.get('examples', [])
+        parts: List[str] = []
+        for sense in senses:
+            parts.append(_SENSE_OPEN)
+            parts.append(sense.get('definition', ''))
+            parts.append(_SPAN_CLOSE)
             level = sense.get('level', '')
-            
-            examples_html = "".join(
-                f'<li class="example">{ex}</li>' 
-                for ex in examples
-            ) if examples else ""
-            
-            html.append(f"""
-                <div class="meaning-container">
-                    <div class="sense-header">
-                        <span class="sense-definition definition-text">{definition}</span>
-                        {f'<span class="cefr">{level}</span>' if level else ''}
-                    </div>
-                    {f'<ul class="examples-list">{examples_html}</ul>' if examples else ''}
-                </div>
-            """)
-        return "".join(html)
+            if level:
+                parts.append(_CEFR_OPEN)
+                parts.append(level)
+                parts.append(_SPAN_CLOSE)
+            parts.append(_DIV_CLOSE)
+            self._append_examples(parts, sense.get('examples', []))
+            parts.append(_DIV_CLOSE)
+        return "".join(parts)
 
     def _format_idiom_examples(self, examples: List[str]) -> str:
-        if not examples:
-            return ""
-        return "<ul class='examples-list'>" + "".join(f'<li class="example">{ex}</li>' for ex in examples) + "</ul>"
+        parts: List[str] = []
+        self._append_examples(parts, examples)
+        return "".join(parts)
 
+    @staticmethod
+    def _append_examples(parts: List[str], examples: List[str]) -> None:
+        if not examples:
+            return
+        parts.append(_EXAMPLES_OPEN)
+        for ex in examples:
+            parts.append(_EXAMPLE_OPEN)
+            parts.append(ex)
+            parts.append(_EXAMPLE_CLOSE)
+        parts.append(_EXAMPLES_CLOSE)
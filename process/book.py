@@ -1,13 +1,52 @@
 # src/book2anki/process/book.py
+import io
 import os
+import re
+import functools
+from concurrent.futures import ProcessPoolExecutor
 import fitz
 import ebooklib
 from ebooklib import epub
-from bs4 import BeautifulSoup
-from textblob import Word, TextBlob
+from bs4 import BeautifulSoup, FeatureNotFound
+import simplemma
 from tqdm import tqdm
 from pathlib import Path
-from typing import ClassVar, List, Set, Optional
+from typing import ClassVar, Dict, FrozenSet, Iterator, List, Set, Optional, Tuple
+
+from core.utils import MP_CONTEXT
+
+# Runs of letters, keeping inner apostrophes so contractions match the stopword list
+_WORD_RE = re.compile(r"[^\W\d_]+(?:['\u2019][^\W\d_]+)*")
+_PROGRESS_EVERY = 10_000
+# Approximate size of each line batch read from plain text books
+_TXT_CHUNK_SIZE = 64 * 1024
+# Below this many pages/documents per worker, process start-up costs more than it saves
+_MIN_UNITS_PER_WORKER = 16
+
+
+def _worker_count(units: int) -> int:
+    return max(1, min(os.cpu_count() or 1, units // _MIN_UNITS_PER_WORKER))
+
+
+def _extract_pages_range(job: Tuple[str, int, int]) -> str:
+    """Extract text of pages [lo, hi) from a PDF (runs in a worker process)"""
+    path, lo, hi = job
+    buf = io.StringIO()
+    with fitz.open(path) as doc:
+        for page in doc.pages(lo, hi):
+            buf.write(page.get_text("text", sort=False))
+            buf.write("\n")
+    return buf.getvalue()
+
+
+def _extract_html_text(content: bytes) -> str:
+    """Extract visible text from an EPUB document (runs in a worker process)"""
+    try:
+        soup = BeautifulSoup(content, 'lxml')
+    except FeatureNotFound:
+        soup = BeautifulSoup(content, 'html.parser')
+    return soup.get_text('\n', strip=True)
+
 
 class BookProcessor:
     CEFR_ORDER: ClassVar[List[str]] = ['A1', 'A2', 'B1', 'B2', 'C1']
@@ -19,8 +58,8 @@ class BookProcessor:
         self.known_words_file: Path = self.config_dir / 'known_words.txt'
         self.config_dir.mkdir(parents=True, exist_ok=True)
         
-        self.default_stopwords: Set[str] = self._load_stopwords()
-        self.known_words: Set[str] = self._load_known_words()
+        self.default_stopwords: FrozenSet[str] = self._load_stopwords()
+        self.known_words: FrozenSet[str] = self._load_known_words()
 
         # Add CEFR directory path
         self.cefr_dir: Path = self.config_dir / 'cefr'
@@ -28,7 +67,11 @@ class BookProcessor:
 
         # Add names file path
         self.names_file: Path = self.config_dir / 'names.txt'
-        self.names: Set[str] = self._load_names()
+        self.names: FrozenSet[str] = self._load_names()
+
+        # Exclusion sets are static for the processor's lifetime; build them once
+        self._base_excluded: FrozenSet[str] = self.default_stopwords | self.known_words
+        self._excluded_cache: Dict[Tuple[Optional[str], bool], FrozenSet[str]] = {}
 
     def extract_words(
         self,
@@ -39,41 +82,68 @@ class BookProcessor:
         exclude_names: bool = False
     ) -> List[str]:
         """Extract words from text using regex pattern"""
-        text = self.process_book(file_path)
-        all_words: List[str] = TextBlob(text).words
-        # text = self._normalize_apostrophes(text)
         seen: Set[str] = set()
+        seen_tokens: Set[str] = set()
         words: List[str] = []
-
-        excluded_words = self.default_stopwords.copy()
-        excluded_words.update(self.known_words)
+        excluded: FrozenSet[str] = self._excluded_words(exclude_up_to, exclude_names)
+
+        total = 0
+        with tqdm(desc="Extracting words", unit=" tokens") as progress:
+            for chunk in self._iter_book_text(file_path):
+                for match in _WORD_RE.finditer(chunk.lower()):
+                    total += 1
+                    if total % _PROGRESS_EVERY == 0:
+                        progress.update(_PROGRESS_EVERY)
+
+                    word = match.group().replace("\u2019", "'")
+                    # A surface form always maps to the same lemma, so only its first occurrence matters
+                    if word in seen_tokens or word in excluded:
+                        continue
+                    seen_tokens.add(word)
+                    if word.endswith("'s"):
+                        word = word[:-2]
+                    lemma = self._lemmatize_word(word) if lemmatize else word
+
+                    if (lemma in seen or
+                        lemma in excluded or
+                        len(lemma) < min_length or
+                        not lemma.isalpha()):
+                        continue
+
+                    seen.add(lemma)
+                    words.append(lemma)
+            progress.update(total % _PROGRESS_EVERY)
+        return (words, total)
+
+    def _excluded_words(self, exclude_up_to: Optional[str], exclude_names: bool) -> FrozenSet[str]:
+        """Fold stopwords, known words, CEFR levels and names into one lookup set"""
         if exclude_up_to:
             exclude_up_to = exclude_up_to.upper()
             if exclude_up_to not in self.CEFR_ORDER:
                 raise ValueError(f"Invalid CEFR level: {exclude_up_to}. Use one of {self.CEFR_ORDER}")
 
+        key = (exclude_up_to or None, exclude_names)
+        cached = self._excluded_cache.get(key)
+        if cached is not None:
+            return cached
+
+        excluded_words = self._base_excluded
+        if exclude_up_to:
             cutoff_index = self.CEFR_ORDER.index(exclude_up_to)
             levels_to_exclude = self.CEFR_ORDER[:cutoff_index + 1]
-            excluded_words.update(self._load_cefr_words(levels_to_exclude))
+            excluded_words |= self._load_cefr_words(levels_to_exclude)
 
         if exclude_names:
-            excluded_words.update(self.names)
-            
-        for word in tqdm(all_words, desc="Extracting words"):
-            lemma = self._lemmatize_word(word) if lemmatize else word.lower()
-            
-            if (not lemma.isalpha() or
-                lemma in excluded_words or
-                lemma in seen or
-                len(lemma) < min_length):
-                continue
-            
-            seen.add(lemma)
-            words.append(lemma)
-        return (words, len(all_words))
+            excluded_words |= self.names
+        self._excluded_cache[key] = excluded_words
+        return excluded_words
 
     def process_book(self, file_path: str) -> str:
         """Main method to process different book formats"""
+        return "\n".join(self._iter_book_text(file_path))
+
+    def _iter_book_text(self, file_path: str) -> Iterator[str]:
+        """Yield book text in chunks (pages, documents or line batches) without materializing it"""
         if not os.path.exists(file_path):
             raise FileNotFoundError(f"File not found: {file_path}")
         
@@ -88,84 +158,71 @@ class BookProcessor:
         else:
             raise ValueError(f"Unsupported file format: {ext}")
 
-    def _process_pdf(self, path: str) -> str:
-        """Process PDF files using PyMuPDF"""
-        text: List[str] = []
+    def _process_pdf(self, path: str) -> Iterator[str]:
+        """Process PDF files using PyMuPDF, splitting pages across processes"""
         with fitz.open(path) as doc:
-            for page in doc:
-                text.append(page.get_text())
-        return "\n".join(text)
-
-    def _process_epub(self, path: str) -> str:
-        """Process EPUB files using ebooklib and BeautifulSoup"""
+            page_count = doc.page_count
+            workers = _worker_count(page_count)
+            if workers == 1:
+                for page in doc:
+                    yield page.get_text("text", sort=False)
+                return
+
+        step = -(-page_count // workers)
+        jobs = [(path, lo, min(lo + step, page_count)) for lo in range(0, page_count, step)]
+        with ProcessPoolExecutor(max_workers=workers, mp_context=MP_CONTEXT) as executor:
+            yield from executor.map(_extract_pages_range, jobs)
+
+    def _process_epub(self, path: str) -> Iterator[str]:
+        """Process EPUB files using ebooklib and BeautifulSoup, parsing documents across processes"""
         book = epub.read_epub(path, {"ignore_ncx": True})
-        text: List[str] = []
-        
-        for item in book.get_items():
-            if item.get_type() == ebooklib.ITEM_DOCUMENT:
-                soup = BeautifulSoup(item.get_content(), 'html.parser')
-                text.append(soup.get_text('\n', strip=True))
-        
-        return "\n".join(text)
-
-    def _process_txt(self, path: str) -> str:
-        """Process plain text files"""
+        contents: List[bytes] = [
+            item.get_content()
+            for item in book.get_items()
+            if item.get_type() == ebooklib.ITEM_DOCUMENT
+        ]
+
+        workers = _worker_count(len(contents))
+        if workers == 1:
+            yield from map(_extract_html_text, contents)
+            return
+
+        with ProcessPoolExecutor(max_workers=workers, mp_context=MP_CONTEXT) as executor:
+            yield from executor.map(_extract_html_text, contents)
+
+    def _process_txt(self, path: str) -> Iterator[str]:
+        """Process plain text files in batches of whole lines"""
         with open(path, 'r', encoding='utf-8') as f:
-            return f.read()
+            for lines in iter(lambda: f.readlines(_TXT_CHUNK_SIZE), []):
+                yield "".join(lines)
         
-    def _load_stopwords(self) -> Set[str]:
+    @staticmethod
+    def _load_wordset(path: Path) -> FrozenSet[str]:
+        """Load one lowercased entry per line, skipping blank lines"""
+        try:
+            text = path.read_text(encoding='utf-8').lower()
+        except FileNotFoundError:
+            return frozenset()
+        return frozenset(filter(None, map(str.strip, text.splitlines())))
+
+    def _load_stopwords(self) -> FrozenSet[str]:
         """Load stopwords from config file"""
-        stopwords: Set[str] = set()
-        if self.stopwords_file.exists():
-            with open(self.stopwords_file, 'r', encoding='utf-8') as f:
-                for line in f:
-                    word = line.strip().lower()
-                    if word:
-                        stopwords.add(word)
-        return stopwords
-
-    def _load_known_words(self) -> Set[str]:
+        return self._load_wordset(self.stopwords_file)
+
+    def _load_known_words(self) -> FrozenSet[str]:
         """Load known words from config file"""
-        known_words: Set[str] = set()
-        if self.known_words_file.exists():
-            with open(self.known_words_file, 'r', encoding='utf-8') as f:
-                for line in f:
-                    word = line.strip().lower()
-                    if word:
-                        known_words.add(word)
-        return known_words
-
-    def _load_names(self) -> Set[str]:
+        return self._load_wordset(self.known_words_file)
+
+    def _load_names(self) -> FrozenSet[str]:
         """Load names from names.txt file"""
-        names: Set[str] = set()
-        if self.names_file.exists():
-            with open(self.names_file, 'r', encoding='utf-8') as f:
-                for line in f:
-                    name = line.strip().lower()
-                    if name:
-                        names.add(name)
-        return names
-
-    def _load_cefr_words(self, levels: List[str]) -> Set[str]:
+        return self._load_wordset(self.names_file)
+
+    def _load_cefr_words(self, levels: List[str]) -> FrozenSet[str]:
         """Load words from specified CEFR level files"""
-        cefr_words: Set[str] = set()
-        for level in levels:
-            level_file = self.cefr_dir / f"{level}.txt"
-            if level_file.exists():
-                with open(level_file, 'r', encoding='utf-8') as f:
-                    cefr_words.update(line.strip().lower() for line in f if line.strip())
-        return cefr_words
-
-    def _lemmatize_word(self, word: str) -> str:
-        """Enhanced lemmatization with POS priority"""
-        word = word.strip().lower()
-        w = Word(word)
-        pos_order = ['v', 'a', 'r']
-
-        for pos_code in pos_order:
-            lemma = w.lemmatize(pos_code)
-            if lemma != word:
-                return lemma
-        
-        # Fallback to default noun if no changes
-        return w.lemmatize()
+        return frozenset().union(*(self._load_wordset(self.cefr_dir / f"{level}.txt") for level in levels))
+
+    @staticmethod
+    @functools.lru_cache(maxsize=200_000)
+    def _lemmatize_word(word: str) -> str:
+        """Dictionary-based lemmatization (memoized per surface form)"""
+        return simplemma.lemmatize(word.strip().lower(), lang='en').lower()
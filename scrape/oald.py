@@ -1,24 +1,66 @@
 # src/book2anki/scrape/oald.py
-from bs4 import BeautifulSoup
+from selectolax.lexbor import LexborHTMLParser, LexborNode
 import aiohttp
 import asyncio
-import aiofiles
-import hashlib
+import logging
+import os
+import sqlite3
+from concurrent.futures import ProcessPoolExecutor
+import threading
 from pathlib import Path
-import json
-from typing import Dict, List
-from core.utils import AsyncRateLimiter
+import gzip
+import zlib
+import orjson
+from typing import Dict, List, Optional, Tuple, Union
+from core.utils import MP_CONTEXT, AdmissionController, AsyncRateLimiter
+
+logger = logging.getLogger(__name__)
 
 class WordNotFound(Exception):
     """Word not found in dictionary"""
     pass
 
-class Word:
-    BASE_URL = "https://www.oxfordlearnersdictionaries.com/definition/english/"
-    MAX_ENTRIES = 5  
-    CACHE_DIR = Path.home() / ".cache/book2anki/word_cache"
-    CACHE_VERSION = "v1" 
+class WordCache:
+    """Processed entries for every word, kept in one SQLite file"""
+    def __init__(self, path: Path):
+        self.path = path
+        self._conn: Optional[sqlite3.Connection] = None
+        # Calls arrive from asyncio.to_thread workers; serialize use of the shared connection
+        self._lock = threading.Lock()
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._conn is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(self.path, isolation_level=None, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute("PRAGMA mmap_size=268435456")
+            conn.execute("CREATE TABLE IF NOT EXISTS entries (word TEXT PRIMARY KEY, version TEXT, json BLOB)")
+            self._conn = conn
+        return self._conn
+
+    def get(self, word: str, version: str) -> Optional[bytes]:
+        with self._lock:
+            row = self._connect().execute(
+                "SELECT json FROM entries WHERE word = ? AND version = ?", (word, version)
+            ).fetchone()
+        return row[0] if row else None
+
+    def put(self, word: str, version: str, data: bytes) -> None:
+        with self._lock:
+            self._connect().execute(
+                "INSERT OR REPLACE INTO entries (word, version, json) VALUES (?, ?, ?)", (word, version, data)
+            )
 
+    def close(self) -> None:
+        """Close the connection, letting SQLite checkpoint the WAL; the next call reopens it"""
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+class EntryParser:
+    """Extracts entry data from OALD pages; pure functions of the HTML so they can run in worker processes"""
     HEADWORD_CLASS = "headword"
     POS_CLASS = "pos"
     PHONS_BR_CLASS = "phons_br"
@@ -32,204 +74,363 @@ class Word:
     IDM_CLASS = "idm"
     PHRASAL_VERBS_CLASS = "phrasal_verb_links"
     PV_CLASS = "pv"
-    
+    ENTRY_CLASS = "entry"
+    TOP_CONTAINER_CLASS = "top-container"
+
+    # Selector strings are built once here instead of formatted on every lookup
+    ENTRY_SELECTOR = f"div.{ENTRY_CLASS}"
+    TOP_CONTAINER_SELECTOR = f"div.{TOP_CONTAINER_CLASS}"
+    HEADWORD_SELECTOR = f"h1.{HEADWORD_CLASS}"
+    POS_SELECTOR = f"span.{POS_CLASS}"
+    PHONS_BR_SELECTOR = f"div.{PHONS_BR_CLASS}"
+    PHONS_NA_SELECTOR = f"div.{PHONS_NA_CLASS}"
+    PHON_SELECTOR = f"span.{PHON_CLASS}"
+    SOUND_SELECTOR = f"div.{SOUND_CLASS}"
+    SENSE_SELECTOR = f"li.{SENSE_CLASS}"
+    DEF_SELECTOR = f"span.{DEF_CLASS}"
+    EXAMPLE_SELECTOR = f"span.{EXAMPLE_CLASS}"
+    DEF_OR_EXAMPLE_SELECTOR = f"{DEF_SELECTOR}, {EXAMPLE_SELECTOR}"
+    IDIOMS_SELECTOR = f"div.{IDIOMS_CLASS}"
+    IDM_SELECTOR = f"span.{IDM_CLASS}"
+    PHRASAL_VERBS_SELECTOR = f"aside.{PHRASAL_VERBS_CLASS}"
+    # Matches a span carrying any "ox3ksym_*" class, not just as its first class
+    CEFR_SELECTOR = 'span[class^="ox3ksym_"], span[class*=" ox3ksym_"]'
+
+    @classmethod
+    def parse_entry(cls, tree: LexborHTMLParser) -> Optional[Dict]:
+        """Parse a word page, or return None if it has no headword and part of speech"""
+        # Locate the entry and its header once; per-field lookups then search small subtrees
+        entry = tree.css_first(cls.ENTRY_SELECTOR) or tree
+        top = entry.css_first(cls.TOP_CONTAINER_SELECTOR) or entry
+        headword = cls.get_headword(top)
+        part_of_speech = cls.get_part_of_speech(top)
+        if not (headword and part_of_speech):
+            return None
+        return {
+            "headword": headword,
+            "part_of_speech": part_of_speech,
+            "pronunciations": cls.get_pronunciations(top),
+            "meanings": cls.get_meanings(entry),
+            "idioms": cls.get_idioms(entry),
+        }
+
+    @classmethod
+    def get_headword(cls, tree: LexborHTMLParser):
+        headword = tree.css_first(cls.HEADWORD_SELECTOR)
+        return headword.text().strip() if headword else None
+
+    @classmethod
+    def get_part_of_speech(cls, tree):
+        pos = tree.css_first(cls.POS_SELECTOR)
+        return pos.text().strip() if pos else None
+
+    @classmethod
+    def get_pronunciation(cls, tree, region_selector):
+        pron = tree.css_first(region_selector)
+        if not pron:
+            return {"ipa": "", "audio": ""}
+        ipa = pron.css_first(cls.PHON_SELECTOR)
+        audio = pron.css_first(cls.SOUND_SELECTOR)
+        return {
+            "ipa": ipa.text().strip() if ipa else "",
+            "audio": (audio.attributes.get("data-src-mp3") or "") if audio else "",
+        }
+
+    @classmethod
+    def get_pronunciations(cls, tree):
+        return {
+            "uk": cls.get_pronunciation(tree, cls.PHONS_BR_SELECTOR),
+            "us": cls.get_pronunciation(tree, cls.PHONS_NA_SELECTOR),
+        }
+
+    @classmethod
+    def get_meanings(cls, tree):
+        senses_container = tree.css_first("ol")
+        if not senses_container:
+            return []
+        return [cls._parse_sense(sense) for sense in senses_container.css(cls.SENSE_SELECTOR)]
+
+    @classmethod
+    def _parse_sense(cls, sense):
+        definition = sense.css_first(cls.DEF_SELECTOR)
+        return {
+            "definition": definition.text().strip() if definition else "",
+            "examples": [ex.text().strip() for ex in sense.css(cls.EXAMPLE_SELECTOR)],
+            "level": cls._extract_cefr_level(sense)
+        }
+
+    @classmethod
+    def _extract_cefr_level(cls, sense_element):
+        symbols_div = sense_element.css_first("div.symbols")
+        if not symbols_div:
+            return ""
+        level_span = symbols_div.css_first(cls.CEFR_SELECTOR)
+        return level_span.attributes["class"].split()[-1].split("_")[-1].upper() if level_span else ""
+
+    @classmethod
+    def get_idioms(cls, tree):
+        idioms_section = tree.css_first(cls.IDIOMS_SELECTOR)
+        if not idioms_section:
+            return []
+        return [cls._parse_idiom(idiom) for idiom in idioms_section.css(cls.IDM_SELECTOR)]
+
+    @classmethod
+    def _parse_idiom(cls, idiom):
+        idiom_text = idiom.text().strip()
+        definition_section = cls._find_next(idiom, "ol.sense_single")
+        # One pass over the section picks up both the definition and the examples
+        def_text = None
+        examples = []
+        for node in definition_section.css(cls.DEF_OR_EXAMPLE_SELECTOR):
+            classes = (node.attributes.get("class") or "").split()
+            if cls.EXAMPLE_CLASS in classes:
+                examples.append(node.text().strip())
+            elif def_text is None:
+                def_text = node
+        return {
+            "idiom": idiom_text,
+            "definition": def_text.text().strip(), #[def_text.text().strip() for def_text in definition_section.css(f"span.{cls.DEF_CLASS}")] if definition_section else [],
+            "examples": examples
+        }
+
+    @staticmethod
+    def _find_next(node: LexborNode, selector: str) -> Optional[LexborNode]:
+        """First match after node in document order (BeautifulSoup's find_next)"""
+        while node is not None:
+            sibling = node.next
+            while sibling is not None:
+                if sibling.tag != "-text" and (match := sibling.css_first(selector)):
+                    return match
+                sibling = sibling.next
+            node = node.parent
+        return None
+
+    @classmethod
+    def get_phrasal_verb_links(cls, tree: LexborHTMLParser) -> Dict[str, str]:
+        section = tree.css_first(cls.PHRASAL_VERBS_SELECTOR)
+        if not section:
+            return {}
+
+        pv_links = {}
+        for li in section.css("li.li"):
+            if a_tag := li.css_first("a.Ref"):
+                verb = a_tag.css_first("span.xh")
+                href = a_tag.attributes.get("href")
+                if verb and href:
+                    full_url = href 
+                    pv_links[verb.text().strip()] = full_url
+        return pv_links
+
+
+    @classmethod
+    def parse_pv_page(cls, tree: LexborHTMLParser):
+        senses = tree.css(cls.SENSE_SELECTOR)
+        return [cls._parse_pv_sense(sense) for sense in senses]
+
+    @classmethod
+    def _parse_pv_sense(cls, sense: LexborNode):
+        definition = sense.css_first(cls.DEF_SELECTOR)
+        examples = sense.css(cls.EXAMPLE_SELECTOR)
+        return {
+            "definition": definition.text().strip() if definition else "",
+            "examples": [ex.text().strip() for ex in examples],
+            "level": cls._extract_cefr_level(sense)
+        }
+
+# Marks a page that had an entry but failed to parse; the worker can't log, so the caller does
+_PARSE_ERROR = "error"
+
+def _parse_entry_page(html: bytes) -> Union[Tuple[Dict, Dict[str, str]], Tuple[str, str], None]:
+    """Parse a word page into (entry, phrasal verb links); runs in the parser pool"""
+    tree = LexborHTMLParser(html)
+    try:
+        entry = EntryParser.parse_entry(tree)
+    except AttributeError as e:
+        # An idiom without its definition list or def span
+        return _PARSE_ERROR, str(e)
+    if entry is None:
+        return None
+    return entry, EntryParser.get_phrasal_verb_links(tree)
+
+
+def _parse_pv_page(html: bytes) -> List[Dict]:
+    """Parse a phrasal verb page into its senses; runs in the parser pool"""
+    return EntryParser.parse_pv_page(LexborHTMLParser(html))
+
+
+# HTML parsing is CPU-bound, so it runs in worker processes instead of on the event loop
+_PARSER_POOL: Optional[ProcessPoolExecutor] = None
+
+def _get_parser_pool() -> ProcessPoolExecutor:
+    global _PARSER_POOL
+    if _PARSER_POOL is None:
+        _PARSER_POOL = ProcessPoolExecutor(max_workers=os.cpu_count(), mp_context=MP_CONTEXT)
+    return _PARSER_POOL
+
+async def _parse_in_pool(func, html: bytes):
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_get_parser_pool(), func, html)
+
+
+class Word:
+    BASE_URL = "https://www.oxfordlearnersdictionaries.com/definition/english/"
+    MAX_ENTRIES = 5  
+    FETCH_ATTEMPTS = 3
+    _SUFFIXES = tuple(f"_{i}" for i in range(1, MAX_ENTRIES + 1))
+    CACHE_DIR = Path.home() / ".cache/book2anki/word_cache"
+    CACHE_VERSION = "v2" 
+    CACHE = WordCache(CACHE_DIR / "cache.sqlite")
+
+    HEADERS = {
+        "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/58.0.3029.110 Safari/537.3",
+        "Accept-Language": "en-US,en;q=0.9"
+    }
+
     RATE_LIMITER = AsyncRateLimiter(max_calls=100, period=1.0)  
-    PV_SEMAPHORE = asyncio.Semaphore(10)
+    PV_MAX_CONCURRENT = 10
+    PV_ADMISSION = AdmissionController(PV_MAX_CONCURRENT)
+
+    # Shared by every Word so connections to OALD stay pooled between lookups
+    _session: Optional[aiohttp.ClientSession] = None
 
     def __init__(self, word: str):
-        self.HEADERS = {
-            "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/58.0.3029.110 Safari/537.3",
-            "Accept-Language": "en-US,en;q=0.9"
-        }
         self.word = word.strip().lower()
         self.entries = []
 
+    @classmethod
+    async def get_session(cls) -> aiohttp.ClientSession:
+        """Return the shared session, creating it on first use"""
+        if cls._session is None or cls._session.closed:
+            cls._session = aiohttp.ClientSession(
+                headers=cls.HEADERS,
+                connector=aiohttp.TCPConnector(limit=100, limit_per_host=64, ttl_dns_cache=300)
+            )
+        return cls._session
+
+    @classmethod
+    async def close(cls) -> None:
+        """Close the shared session, parser pool and cache connection; call once all lookups are done"""
+        global _PARSER_POOL
+        if cls._session is not None:
+            await cls._session.close()
+            cls._session = None
+        if _PARSER_POOL is not None:
+            _PARSER_POOL.shutdown()
+            _PARSER_POOL = None
+        await asyncio.to_thread(cls.CACHE.close)
+
     async def initialize(self):
         """Load cached data or fetch fresh"""
-        cache_path = await self._get_cache_path()
         if not await self._try_load_cached_data():
-            async with aiohttp.ClientSession(headers=self.HEADERS) as session:
-                await self.fetch_word(session)
-                await self._cache_processed_data()
-
-    async def _get_cache_path(self) -> Path:
-        cache_key = f"{self.word}_{self.CACHE_VERSION}"
-        filename = hashlib.md5(cache_key.encode()).hexdigest() + ".json"
-        return self.CACHE_DIR / filename
+            session = await Word.get_session()
+            await self.fetch_word(session)
+            await self._cache_processed_data()
 
     async def _try_load_cached_data(self) -> bool:
-        cache_path = await self._get_cache_path()
-        if not cache_path.exists():
-            return False
         try:
-            async with aiofiles.open(cache_path, "r") as f:
-                self.entries = json.loads(await f.read())
-                return True
-        except Exception as e:
-            print(f"Cache load failed: {str(e)}")
+            data = await asyncio.to_thread(self.CACHE.get, self.word, self.CACHE_VERSION)
+            if data is None:
+                return False
+            self.entries = orjson.loads(gzip.decompress(data))
+            return True
+        except (sqlite3.Error, OSError, EOFError, ValueError, zlib.error) as e:
+            logger.debug("Cache load failed for %s: %s", self.word, e)
             return False
 
     async def _cache_processed_data(self):
-        cache_path = await self._get_cache_path()
         try:
-            self.CACHE_DIR.mkdir(parents=True, exist_ok=True)
-            async with aiofiles.open(cache_path, "w", encoding="utf-8") as f:
-                await f.write(json.dumps(self.entries, ensure_ascii=False))
-        except Exception as e:
-            print(f"Cache save failed: {str(e)}")
+            # Fast level-1 gzip roughly halves the bytes SQLite has to write and cache
+            data = gzip.compress(orjson.dumps(self.entries), 1)
+            await asyncio.to_thread(self.CACHE.put, self.word, self.CACHE_VERSION, data)
+        except (sqlite3.Error, OSError, TypeError) as e:
+            logger.debug("Cache save failed for %s: %s", self.word, e)
 
     async def fetch_word(self, session: aiohttp.ClientSession):
         """Main fetch method with proper session handling"""
-        tasks = [self._fetch_variation(session, f"{self.BASE_URL}{self.word}_{i}") 
-                for i in range(1, self.MAX_ENTRIES+1)]
-        results = await asyncio.gather(*tasks)
-        
-        process_tasks = []
-        for soup in results:
-            if self._is_valid_entry(soup):
-                process_tasks.append(self._process_entry(soup, session))
-        
-        self.entries = await asyncio.gather(*process_tasks)
+        # OALD numbers entries contiguously, so probe in order and stop at the first gap. A missing
+        # entry may redirect to a 200 page without a headword, so a page that fails parsing is a gap too
+        parsed = []
+        prefix = self.BASE_URL + self.word
+        for suffix in self._SUFFIXES:
+            html = await self._fetch_variation(session, prefix + suffix)
+            if html is None:
+                break
+            result = await _parse_in_pool(_parse_entry_page, html)
+            if result is None:
+                break
+            if result[0] == _PARSE_ERROR:
+                logger.debug("Error processing entry %s%s: %s", self.word, suffix, result[1])
+                continue
+            parsed.append(result)
+
+        # Fetch phrasal verbs for all entries in one batch; a verb listed under several entries is fetched once
+        all_pv_links: Dict[str, str] = {}
+        for _, pv_links in parsed:
+            for verb, url in pv_links.items():
+                all_pv_links.setdefault(verb, url)
+        pv_data = await self.get_phrasal_verbs(all_pv_links, session)
+
+        self.entries = [self._process_entry(entry, pv_links, pv_data) for entry, pv_links in parsed]
 
         if not self.entries:
             raise WordNotFound(f"Word '{self.word}' not found")
 
-    async def _fetch_variation(self, session: aiohttp.ClientSession, url: str):
-        """Fetch individual variation with rate limiting"""
-        await self.RATE_LIMITER.wait()
-        try:
-            async with session.get(url, allow_redirects=True) as response:
-                if response.status == 200:
-                    return BeautifulSoup(await response.text(), 'lxml')
-                return None
-        except (aiohttp.ClientError, asyncio.TimeoutError):
-            return None
-
-    async def get_phrasal_verbs(self, soup: BeautifulSoup, session: aiohttp.ClientSession):
-        """Fetch phrasal verbs with proper URL resolution"""
-        section = soup.find("aside", class_=self.PHRASAL_VERBS_CLASS)
-        if not section:
-            return []
+    async def _fetch_variation(self, session: aiohttp.ClientSession, url: str) -> Optional[bytes]:
+        """Fetch individual variation with rate limiting; transient failures are retried so they don't end the probe"""
+        for attempt in range(self.FETCH_ATTEMPTS):
+            await self.RATE_LIMITER.wait()
+            try:
+                async with session.get(url, allow_redirects=True) as response:
+                    await self._adapt_concurrency(response)
+                    if response.status == 200:
+                        # Raw bytes go straight to lexbor; decoding here would just be redone by the parser
+                        return await response.read()
+                    if response.status != 429 and response.status < 500:
+                        return None
+                    logger.debug("Fetching %s returned %s", url, response.status)
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                logger.debug("Fetching %s failed: %s", url, e)
+            if attempt < self.FETCH_ATTEMPTS - 1:
+                await asyncio.sleep(1 * (attempt + 1))
+        return None
 
-        pv_links = {}
-        for li in section.find_all("li", class_="li"):
-            if a_tag := li.find("a", class_="Ref"):
-                verb = a_tag.find("span", class_="xh")
-                href = a_tag.get("href")
-                if verb and href:
-                    full_url = href 
-                    pv_links[verb.text.strip()] = full_url
+    async def _adapt_concurrency(self, response: aiohttp.ClientResponse):
+        """Halve phrasal verb concurrency when OALD signals rate limiting, recover one slot per clean response"""
+        limit = self.PV_ADMISSION.max_concurrent
+        remaining = response.headers.get("X-RateLimit-Remaining", "")
+        if response.status == 429 or "Retry-After" in response.headers:
+            await self.PV_ADMISSION.resize(limit // 2)
+        elif remaining.isdigit() and int(remaining) < limit:
+            await self.PV_ADMISSION.resize(int(remaining))
+        elif limit < self.PV_MAX_CONCURRENT:
+            await self.PV_ADMISSION.resize(limit + 1)
 
+    async def get_phrasal_verbs(self, pv_links: Dict[str, str], session: aiohttp.ClientSession) -> Dict[str, List[Dict]]:
+        """Fetch phrasal verbs with proper URL resolution, keyed by verb"""
         tasks = [self._fetch_pv_data(session, verb, url) for verb, url in pv_links.items()]
         results = await asyncio.gather(*tasks)
         
-        return [{"phrasal_verb": verb, "senses": data} for verb, data in results if data]
+        return {verb: data for verb, data in results if data}
 
     async def _fetch_pv_data(self, session: aiohttp.ClientSession, verb: str, url: str):
-        async with self.PV_SEMAPHORE:
+        async with self.PV_ADMISSION:
             try:
                 async with session.get(url) as response:
+                    await self._adapt_concurrency(response)
                     response.raise_for_status()
-                    soup = BeautifulSoup(await response.text(), 'lxml')
-                    return (verb, self._parse_pv_page(soup))
-            except Exception as e:
-                print(f"Failed to fetch phrasal verb {verb}: {str(e)}")
+                    html = await response.read()
+                return (verb, await _parse_in_pool(_parse_pv_page, html))
+            except (aiohttp.ClientError, asyncio.TimeoutError, OSError) as e:
+                logger.debug("Failed to fetch phrasal verb %s: %s", verb, e)
                 return (verb, None)
 
-    def _parse_pv_page(self, soup: BeautifulSoup):
-        senses = soup.find_all("li", class_=self.SENSE_CLASS)
-        return [self._parse_pv_sense(sense) for sense in senses]
-
-    def _parse_pv_sense(self, sense: BeautifulSoup):
-        definition = sense.find("span", class_=self.DEF_CLASS)
-        examples = sense.find_all("span", class_=self.EXAMPLE_CLASS)
-        return {
-            "definition": definition.text.strip() if definition else "",
-            "examples": [ex.text.strip() for ex in examples],
-            "level": self._extract_cefr_level(sense)
-        }
-
-    def _is_valid_entry(self, soup: BeautifulSoup) -> bool:
-        return bool(
-            soup and
-            soup.find("h1", class_=self.HEADWORD_CLASS) and
-            soup.find("span", class_=self.POS_CLASS)
-        )
-    
-    def get_headword(self, soup: BeautifulSoup):
-        headword = soup.find("h1", class_=self.HEADWORD_CLASS)
-        return headword.text.strip() if headword else None
-
-    def get_part_of_speech(self, soup):
-        pos = soup.find("span", class_=self.POS_CLASS)
-        return pos.text.strip() if pos else None
-
-    def get_pronunciation(self, soup, region_class):
-        pron = soup.find("div", class_=region_class)
-        if not pron:
-            return {"ipa": "", "audio": ""}
-        ipa = pron.find("span", class_=self.PHON_CLASS)
-        audio = pron.find("div", class_=self.SOUND_CLASS)
-        return {
-            "ipa": ipa.text.strip() if ipa else "",
-            "audio": audio["data-src-mp3"] if audio and "data-src-mp3" in audio.attrs else "",
-        }
-
-    def get_pronunciations(self, soup):
-        return {
-            "uk": self.get_pronunciation(soup, self.PHONS_BR_CLASS),
-            "us": self.get_pronunciation(soup, self.PHONS_NA_CLASS),
-        }
-
-    def get_meanings(self, soup):
-        senses_container = soup.find("ol")
-        if not senses_container:
-            return []
-        return [self._parse_sense(sense) for sense in senses_container.find_all("li", class_=self.SENSE_CLASS)]
-
-    def _parse_sense(self, sense):
-        return {
-            "definition": sense.find("span", class_=self.DEF_CLASS).text.strip() if sense.find("span", class_=self.DEF_CLASS) else "",
-            "examples": [ex.text.strip() for ex in sense.find_all("span", class_=self.EXAMPLE_CLASS)],
-            "level": self._extract_cefr_level(sense)
-        }
-
-    def _extract_cefr_level(self, sense_element):
-        symbols_div = sense_element.find("div", class_="symbols")
-        if not symbols_div:
-            return ""
-        level_span = symbols_div.find("span", class_=lambda x: x and x.startswith("ox3ksym_"))
-        return level_span["class"][-1].split("_")[-1].upper() if level_span else ""
-
-    def get_idioms(self, soup):
-        idioms_section = soup.find("div", class_=self.IDIOMS_CLASS)
-        if not idioms_section:
-            return []
-        return [self._parse_idiom(idiom) for idiom in idioms_section.find_all("span", class_=self.IDM_CLASS)]
-
-    def _parse_idiom(self, idiom):
-        idiom_text = idiom.text.strip()
-        definition_section = idiom.find_next("ol", class_="sense_single")
-        def_text = definition_section.find("span", class_=self.DEF_CLASS)
-        return {
-            "idiom": idiom_text,
-            "definition": def_text.text.strip(), #[def_text.text.strip() for def_text in definition_section.find_all("span", class_=self.DEF_CLASS)] if definition_section else [],
-            "examples": [ex.text.strip() for ex in definition_section.find_all("span", class_=self.EXAMPLE_CLASS)] if definition_section else []
-        }
-    
-    async def _process_entry(self, soup: BeautifulSoup, session: aiohttp.ClientSession) -> Dict:
-        try:
-            return {
-                "headword": self.get_headword(soup),
-                "part_of_speech": self.get_part_of_speech(soup),
-                "pronunciations": self.get_pronunciations(soup),
-                "meanings": self.get_meanings(soup),
-                "idioms": self.get_idioms(soup),
-                "phrasal_verbs": await self.get_phrasal_verbs(soup, session)
-            }
-        except Exception as e:
-            # print(f"Error processing entry: {str(e)}")
-            return {}
+    @staticmethod
+    def _process_entry(entry: Dict, pv_links: Dict[str, str], pv_data: Dict[str, List[Dict]]) -> Dict:
+        """Attach this entry's fetched phrasal verbs, in the order the entry lists them"""
+        entry["phrasal_verbs"] = [
+            {"phrasal_verb": verb, "senses": pv_data[verb]} for verb in pv_links if verb in pv_data
+        ]
+        return entry
 
     def get_word_info(self) -> list:
         return self.entries